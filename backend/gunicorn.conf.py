@@ -0,0 +1,19 @@
+"""
+Gunicorn configuration for production deployments.
+
+Run from the backend directory:
+    gunicorn main:app -c gunicorn.conf.py
+
+Set WEB_CONCURRENCY to override the number of worker processes.
+"""
+
+import multiprocessing
+import os
+
+bind = os.getenv("BIND", "0.0.0.0:8000")
+workers = int(os.getenv("WEB_CONCURRENCY") or multiprocessing.cpu_count() * 2 + 1)
+
+# Expose the worker count to the app, which splits its API rate limits per worker
+os.environ["WEB_CONCURRENCY"] = str(workers)
+worker_class = "uvicorn.workers.UvicornWorker"
+keepalive = 30
@@ -11,48 +11,216 @@ Complete implementation with all 6 days of features:
 
 import os
 import uuid
+import asyncio
+import hashlib
+import threading
+import anyio
 import aiofiles
-import requests
+import aiofiles.os
+import httpx
 import assemblyai as aai
+from aiolimiter import AsyncLimiter
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Optional
-from dotenv import load_dotenv
+from typing import List, Optional
 from fastapi import FastAPI, File, UploadFile, HTTPException, Form
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, ValidationInfo, field_validator
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
-# Load environment variables
-load_dotenv()
+# Settings loaded and validated once from the environment / .env file.
+# .env paths are anchored to this file so they are found no matter which
+# directory the server is started from (backend/.env takes priority).
+BACKEND_DIR = Path(__file__).parent
+
+class Settings(BaseSettings):
+    model_config = SettingsConfigDict(
+        env_file=(BACKEND_DIR.parent / ".env", BACKEND_DIR / ".env"),
+        extra="ignore"
+    )
+
+    # API keys
+    murf_api_key: Optional[str] = None
+    assemblyai_api_key: Optional[str] = None
+
+    # Development mode (auto-reload when running main.py directly)
+    dev_reload: bool = False
+
+    # Serve /static from FastAPI; disable when a reverse proxy serves the
+    # frontend assets directly (see deploy/nginx.conf)
+    serve_static: bool = True
+
+    # Number of worker processes actually running (exported by gunicorn.conf.py
+    # and `python main.py`); used to split the vendor rate limits per worker.
+    # Unset means a single process, e.g. a plain `uvicorn main:app`.
+    web_concurrency: Optional[int] = Field(default=None, ge=1)
+
+    # Allowed CORS origin(s), comma-separated
+    frontend_origin: str = "http://localhost:8000"
+
+    @field_validator("dev_reload", "serve_static", "web_concurrency", mode="before")
+    @classmethod
+    def blank_as_default(cls, value, info: ValidationInfo):
+        """Treat blank values (e.g. `DEV_RELOAD=` in .env) as unset"""
+        if isinstance(value, str) and not value.strip():
+            return cls.model_fields[info.field_name].default
+        return value
+
+settings = Settings()
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Voice Agents API",
     description="Complete voice agents application with TTS, STT, and audio recording",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
+# Upload limits
+MAX_UPLOAD_SIZE = 50 * 1024 * 1024  # 50MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB
+
+# Batch transcription limits
+MAX_BATCH_FILES = 10
+MAX_CONCURRENT_TRANSCRIPTIONS = 10
+
+# Maximum request body size per upload route (allows for multipart overhead)
+MULTIPART_OVERHEAD = 64 * 1024
+UPLOAD_BODY_LIMITS = {
+    "/upload-audio": MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD,
+    "/transcribe-file": MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD,
+    "/transcribe-batch": MAX_BATCH_FILES * (MAX_UPLOAD_SIZE + MULTIPART_OVERHEAD),
+}
+
+class UploadSizeLimitMiddleware:
+    """Reject oversized uploads on the upload routes before the body is stored
+
+    A declared Content-Length over the limit is rejected straight away; bodies
+    without one (chunked uploads) are counted as they are received and aborted
+    as soon as the running total passes the limit. Plain ASGI middleware, so
+    other routes pass straight through without extra per-request overhead.
+    """
+
+    def __init__(self, app, limits: dict):
+        self.app = app
+        self.limits = limits
+
+    async def __call__(self, scope, receive, send):
+        limit = self.limits.get(scope["path"]) if scope["type"] == "http" else None
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        detail = f"Request body too large (max {limit // (1024 * 1024)}MB)"
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                if value.isdigit() and int(value) > limit:
+                    response = ORJSONResponse(status_code=413, content={"detail": detail})
+                    await response(scope, receive, send)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Raised while Starlette parses the form, so FastAPI turns
+                    # it into the 413 response before the rest is read
+                    raise HTTPException(status_code=413, detail=detail)
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+# Registered before CORSMiddleware so 413 responses still carry CORS headers
+app.add_middleware(UploadSizeLimitMiddleware, limits=UPLOAD_BODY_LIMITS)
+
 # CORS middleware for frontend communication
+# Explicit origins plus max_age let browsers cache preflight responses
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=[origin.strip() for origin in settings.frontend_origin.split(",")],
     allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+    allow_methods=["GET", "POST", "DELETE"],
+    allow_headers=["Content-Type", "api-key"],
+    max_age=86400,
 )
 
 # Create uploads directory if it doesn't exist
 UPLOADS_DIR = Path("uploads")
 UPLOADS_DIR.mkdir(exist_ok=True)
 
-# API Keys from environment
-MURF_API_KEY = os.getenv("MURF_API_KEY")
-ASSEMBLYAI_API_KEY = os.getenv("ASSEMBLYAI_API_KEY")
+# Accepted audio MIME types for upload and transcription
+ALLOWED_AUDIO_TYPES = frozenset({
+    "audio/wav", "audio/mp3", "audio/mpeg", "audio/mp4",
+    "audio/webm", "audio/ogg", "audio/flac", "audio/aac"
+})
+
+# Parallel unlink workers for /cleanup-uploads
+CLEANUP_WORKERS = 32
+
+# LRU cache of transcripts keyed by audio content hash
+MAX_TRANSCRIPT_CACHE = 1000
+transcript_cache: "OrderedDict[str, str]" = OrderedDict()
+transcript_cache_lock = threading.Lock()
+
+# Client-side rate limits for external APIs (requests per second, all workers combined)
+MURF_RATE_LIMIT = 10
+ASSEMBLYAI_RATE_LIMIT = 60  # AssemblyAI allows 20k requests / 5 min
+RATE_LIMIT_MAX_WAIT = 10  # seconds to queue for a slot before returning 503
+MURF_RETRY_BACKOFF = (1, 5, 15)  # seconds between retries on HTTP 429
+
+# Limiters live in each worker process, so each one gets an equal share of the
+# combined rate: N requests per WORKER_COUNT seconds per worker
+WORKER_COUNT = 1 if settings.dev_reload else (settings.web_concurrency or 1)
+murf_limiter = AsyncLimiter(MURF_RATE_LIMIT, WORKER_COUNT)
+assemblyai_limiter = AsyncLimiter(ASSEMBLYAI_RATE_LIMIT, WORKER_COUNT)
 
 # Configure AssemblyAI
-if ASSEMBLYAI_API_KEY:
-    aai.settings.api_key = ASSEMBLYAI_API_KEY
+if settings.assemblyai_api_key:
+    aai.settings.api_key = settings.assemblyai_api_key
+
+# Shared async HTTP clients for Murf and AssemblyAI calls (created on startup).
+# Base URL and auth headers are set once instead of on every request.
+murf_client: Optional[httpx.AsyncClient] = None
+assemblyai_client: Optional[httpx.AsyncClient] = None
+
+# Caps in-flight AssemblyAI jobs across all requests (created on startup)
+transcription_semaphore: Optional[asyncio.Semaphore] = None
+
+@app.on_event("startup")
+async def open_http_clients():
+    """Create pooled HTTP clients so API calls reuse keep-alive connections"""
+    global murf_client, assemblyai_client, transcription_semaphore
+    murf_client = httpx.AsyncClient(
+        base_url="https://api.murf.ai/v1",
+        headers={
+            "Content-Type": "application/json",
+            "api-key": settings.murf_api_key or ""
+        },
+        timeout=30,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    )
+    assemblyai_client = httpx.AsyncClient(
+        base_url="https://api.assemblyai.com/v2",
+        headers={"authorization": settings.assemblyai_api_key or ""},
+        timeout=60,
+        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+    )
+    transcription_semaphore = asyncio.Semaphore(MAX_CONCURRENT_TRANSCRIPTIONS)
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Close the shared HTTP clients and their pooled connections"""
+    for client in (murf_client, assemblyai_client):
+        if client is not None:
+            await client.aclose()
 
 # Pydantic models for request/response
 class TTSRequest(BaseModel):
@@ -76,80 +244,194 @@ class TranscriptionResponse(BaseModel):
     transcription: Optional[str] = None
     message: str
 
+# Helpers
+
+async def acquire_rate_limit(limiter: AsyncLimiter, service: str):
+    """Wait for a rate-limit slot, or raise 503 if none frees up in time"""
+    try:
+        await asyncio.wait_for(limiter.acquire(), timeout=RATE_LIMIT_MAX_WAIT)
+    except asyncio.TimeoutError:
+        raise HTTPException(
+            status_code=503,
+            detail=f"{service} rate limit reached, please retry later",
+            headers={"Retry-After": str(RATE_LIMIT_MAX_WAIT)}
+        )
+
+def check_upload_size(audio_file: UploadFile):
+    """Reject an upload whose parsed size already exceeds MAX_UPLOAD_SIZE"""
+    if audio_file.size is not None and audio_file.size > MAX_UPLOAD_SIZE:
+        raise HTTPException(status_code=413, detail="File too large (max 50MB)")
+
+def remove_file(path: str) -> bool:
+    """Delete a file, returning False if it was already gone"""
+    try:
+        os.unlink(path)
+        return True
+    except FileNotFoundError:
+        return False
+
+async def iter_upload_chunks(audio_file: UploadFile):
+    """Yield an uploaded file in chunks, aborting once it exceeds MAX_UPLOAD_SIZE"""
+    total = 0
+    while chunk := await audio_file.read(UPLOAD_CHUNK_SIZE):
+        total += len(chunk)
+        if total > MAX_UPLOAD_SIZE:
+            raise HTTPException(status_code=413, detail="File too large (max 50MB)")
+        yield chunk
+
+async def hash_upload(audio_file: UploadFile) -> str:
+    """Hash an uploaded file (enforcing MAX_UPLOAD_SIZE), then rewind it for re-reading"""
+    hasher = hashlib.blake2b(digest_size=16)
+    async for chunk in iter_upload_chunks(audio_file):
+        hasher.update(chunk)
+    await audio_file.seek(0)
+    return hasher.hexdigest()
+
+def get_cached_transcript(digest: str) -> Optional[str]:
+    """Return a cached transcript for this content hash, marking it most recently used"""
+    with transcript_cache_lock:
+        transcription = transcript_cache.get(digest)
+        if transcription is not None:
+            transcript_cache.move_to_end(digest)
+        return transcription
+
+def cache_transcript(digest: str, transcription: str):
+    """Store a transcript, evicting the least recently used entries beyond MAX_TRANSCRIPT_CACHE"""
+    with transcript_cache_lock:
+        transcript_cache[digest] = transcription
+        transcript_cache.move_to_end(digest)
+        while len(transcript_cache) > MAX_TRANSCRIPT_CACHE:
+            transcript_cache.popitem(last=False)
+
+async def upload_to_assemblyai(audio_file: UploadFile) -> str:
+    """Stream an uploaded file to AssemblyAI and return the hosted upload URL"""
+    await acquire_rate_limit(assemblyai_limiter, "AssemblyAI")
+    response = await assemblyai_client.post("/upload", content=iter_upload_chunks(audio_file))
+    if response.status_code != 200:
+        raise HTTPException(
+            status_code=500,
+            detail=f"AssemblyAI upload error: {response.status_code} - {response.text}"
+        )
+    return response.json()["upload_url"]
+
+async def transcribe_audio(audio_file: UploadFile, digest: str) -> str:
+    """Upload an audio file to AssemblyAI and return the transcript text"""
+    cached = get_cached_transcript(digest)
+    if cached is not None:
+        return cached
+
+    async with transcription_semaphore:
+        upload_url = await upload_to_assemblyai(audio_file)
+
+        # Create transcriber instance; the SDK call blocks while polling,
+        # so run it in a worker thread to keep the event loop free
+        transcriber = aai.Transcriber()
+        await acquire_rate_limit(assemblyai_limiter, "AssemblyAI")
+        try:
+            transcript = await anyio.to_thread.run_sync(transcriber.transcribe, upload_url)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"AssemblyAI error: {e}")
+
+    if transcript.status == aai.TranscriptStatus.error:
+        raise HTTPException(
+            status_code=500, 
+            detail=f"Transcription failed: {transcript.error if hasattr(transcript, 'error') else 'Unknown error'}"
+        )
+
+    if transcript.text is not None:
+        cache_transcript(digest, transcript.text)
+    return transcript.text
+
 # Mount static files (frontend)
 frontend_path = Path(__file__).parent.parent / "frontend"
-if frontend_path.exists():
+if settings.serve_static and frontend_path.exists():
     app.mount("/static", StaticFiles(directory=str(frontend_path)), name="static")
 
-# Routes
+FALLBACK_HTML = """
+<!DOCTYPE html>
+<html>
+<head><title>Voice Agents</title></head>
+<body>
+    <h1>Voice Agents Backend Running!</h1>
+    <p>Frontend files not found. Please create the frontend directory.</p>
+    <p>API Documentation: <a href="/docs">/docs</a></p>
+</body>
+</html>
+"""
 
-@app.get("/", response_class=HTMLResponse)
-async def serve_frontend():
-    """Day 1: Serve the main HTML page"""
+# Landing page contents, read once on startup (re-read per request in dev_reload mode)
+index_html: bytes = FALLBACK_HTML.encode("utf-8")
+
+def load_index_html() -> bytes:
+    """Read the frontend index.html, falling back to a placeholder page"""
     try:
         frontend_file = frontend_path / "index.html"
         if frontend_file.exists():
-            async with aiofiles.open(frontend_file, mode='r', encoding='utf-8') as f:
-                content = await f.read()
-            return HTMLResponse(content=content)
-        else:
-            return HTMLResponse(content="""
-            <!DOCTYPE html>
-            <html>
-            <head><title>Voice Agents</title></head>
-            <body>
-                <h1>Voice Agents Backend Running!</h1>
-                <p>Frontend files not found. Please create the frontend directory.</p>
-                <p>API Documentation: <a href="/docs">/docs</a></p>
-            </body>
-            </html>
-            """)
+            return frontend_file.read_bytes()
+        return FALLBACK_HTML.encode("utf-8")
     except Exception as e:
-        return HTMLResponse(content=f"<h1>Error loading frontend: {str(e)}</h1>")
+        return f"<h1>Error loading frontend: {str(e)}</h1>".encode("utf-8")
+
+@app.on_event("startup")
+async def cache_index_html():
+    """Cache the landing page in memory so GET / does no disk I/O"""
+    global index_html
+    index_html = load_index_html()
+
+# Routes
+
+@app.get("/", response_class=HTMLResponse)
+async def serve_frontend():
+    """Day 1: Serve the main HTML page"""
+    if settings.dev_reload:
+        # Pick up frontend edits without restarting the server
+        content = await anyio.to_thread.run_sync(load_index_html)
+        return HTMLResponse(content=content, headers={"Cache-Control": "no-cache"})
+    return HTMLResponse(content=index_html, headers={"Cache-Control": "public, max-age=300"})
 
 @app.post("/generate-audio", response_model=TTSResponse)
 async def generate_audio(request: TTSRequest):
     """Day 2: Text-to-Speech using Murf API"""
-    if not MURF_API_KEY:
+    if not settings.murf_api_key:
         raise HTTPException(status_code=500, detail="Murf API key not configured")
     
     if not request.text.strip():
         raise HTTPException(status_code=400, detail="Text cannot be empty")
     
     try:
-        # Murf API endpoint and headers
-        murf_url = "https://api.murf.ai/v1/speech/generate"
-        headers = {
-            "Content-Type": "application/json",
-            "api-key": MURF_API_KEY
-        }
-        
         # Request payload
         payload = {
             "text": request.text,
             "voiceId": request.voice_id
         }
         
-        # Make request to Murf API
-        response = requests.post(murf_url, json=payload, headers=headers, timeout=30)
+        # Make request to Murf API, backing off and retrying on HTTP 429
+        for delay in (*MURF_RETRY_BACKOFF, None):
+            await acquire_rate_limit(murf_limiter, "Murf API")
+            response = await murf_client.post("/speech/generate", json=payload)
+            if response.status_code != 429 or delay is None:
+                break
+            await asyncio.sleep(delay)
         
         if response.status_code == 200:
             result = response.json()
             audio_url = result.get("audioFile")
             
             if audio_url:
-                return TTSResponse(
-                    success=True,
-                    audio_url=audio_url,
-                    message="Audio generated successfully"
-                )
+                return {
+                    "success": True,
+                    "audio_url": audio_url,
+                    "message": "Audio generated successfully"
+                }
             else:
                 raise HTTPException(status_code=500, detail="No audio URL returned from Murf API")
         else:
             error_detail = f"Murf API error: {response.status_code} - {response.text}"
             raise HTTPException(status_code=response.status_code, detail=error_detail)
             
-    except requests.exceptions.RequestException as e:
+    except HTTPException:
+        raise
+    except httpx.RequestError as e:
         raise HTTPException(status_code=500, detail=f"Network error: {str(e)}")
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Unexpected error: {str(e)}")
@@ -159,118 +441,164 @@ async def upload_audio(audio_file: UploadFile = File(...)):
     """Day 5: Handle audio file uploads"""
     
     # Validate file type
-    allowed_types = [
-        "audio/wav", "audio/mp3", "audio/mpeg", "audio/mp4", 
-        "audio/webm", "audio/ogg", "audio/flac", "audio/aac"
-    ]
-    
-    if audio_file.content_type not in allowed_types:
+    if audio_file.content_type not in ALLOWED_AUDIO_TYPES:
         raise HTTPException(
             status_code=400, 
             detail=f"Unsupported file type: {audio_file.content_type}"
         )
     
-    # Validate file size (max 50MB)
-    max_size = 50 * 1024 * 1024  # 50MB
-    content = await audio_file.read()
-    if len(content) > max_size:
-        raise HTTPException(status_code=400, detail="File too large (max 50MB)")
+    check_upload_size(audio_file)
+    
+    # Write to a temporary name first; the final name is the content hash
+    file_extension = Path(audio_file.filename).suffix
+    temp_path = UPLOADS_DIR / f".{uuid.uuid4()}.part"
     
     try:
-        # Generate unique filename
-        file_extension = Path(audio_file.filename).suffix
-        unique_filename = f"{uuid.uuid4()}{file_extension}"
-        file_path = UPLOADS_DIR / unique_filename
-        
-        # Save file
-        async with aiofiles.open(file_path, 'wb') as f:
-            await f.write(content)
-        
-        return UploadResponse(
-            success=True,
-            filename=unique_filename,
-            content_type=audio_file.content_type,
-            size=len(content),
-            message="File uploaded successfully"
-        )
+        # Stream file to disk in chunks (size limit is enforced while reading)
+        size = 0
+        hasher = hashlib.blake2b(digest_size=16)
+        async with aiofiles.open(temp_path, 'wb') as f:
+            async for chunk in iter_upload_chunks(audio_file):
+                size += len(chunk)
+                hasher.update(chunk)
+                await f.write(chunk)
         
+        # Identical content maps to the same file, so repeat uploads are deduplicated
+        content_filename = f"{hasher.hexdigest()}{file_extension}"
+        file_path = UPLOADS_DIR / content_filename
+        already_uploaded = await aiofiles.os.path.exists(file_path)
+        if already_uploaded:
+            await aiofiles.os.remove(temp_path)
+        else:
+            await aiofiles.os.replace(temp_path, file_path)
+    except HTTPException:
+        temp_path.unlink(missing_ok=True)
+        raise
     except Exception as e:
+        temp_path.unlink(missing_ok=True)
         raise HTTPException(status_code=500, detail=f"Upload failed: {str(e)}")
+    
+    return {
+        "success": True,
+        "filename": content_filename,
+        "content_type": audio_file.content_type,
+        "size": size,
+        "message": "File already uploaded" if already_uploaded else "File uploaded successfully"
+    }
 
 @app.post("/transcribe-file", response_model=TranscriptionResponse)
 async def transcribe_file(audio_file: UploadFile = File(...)):
     """Day 6: Transcribe audio using AssemblyAI"""
     
-    if not ASSEMBLYAI_API_KEY:
+    if not settings.assemblyai_api_key:
         raise HTTPException(status_code=500, detail="AssemblyAI API key not configured")
     
     # Validate file type
-    allowed_types = [
-        "audio/wav", "audio/mp3", "audio/mpeg", "audio/mp4", 
-        "audio/webm", "audio/ogg", "audio/flac", "audio/aac"
-    ]
-    
-    if audio_file.content_type not in allowed_types:
+    if audio_file.content_type not in ALLOWED_AUDIO_TYPES:
         raise HTTPException(
             status_code=400, 
             detail=f"Unsupported file type for transcription: {audio_file.content_type}"
         )
     
+    check_upload_size(audio_file)
+    
     try:
-        # Save uploaded audio file to disk for AssemblyAI
-        file_ext = Path(audio_file.filename).suffix or '.tmp'
-        temp_path = UPLOADS_DIR / f"transcribe_{uuid.uuid4()}{file_ext}"
-        try:
-            async with aiofiles.open(temp_path, 'wb') as out_file:
-                content = await audio_file.read()
-                await out_file.write(content)
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Failed to save file for transcription: {e}")
-
-        # Create transcriber instance
-        transcriber = aai.Transcriber()
-        try:
-            transcript = transcriber.transcribe(str(temp_path))
-        except Exception as e:
-            temp_path.unlink(missing_ok=True)
-            raise HTTPException(status_code=500, detail=f"AssemblyAI error: {e}")
-
-        temp_path.unlink(missing_ok=True)  # Clean up temp file
+        # Hash the upload for the transcript cache, then stream it straight to
+        # AssemblyAI in chunks so the whole file is never held in memory
+        digest = await hash_upload(audio_file)
+        transcription = await transcribe_audio(audio_file, digest)
 
-        if transcript.status == aai.TranscriptStatus.error:
-            raise HTTPException(
-                status_code=500, 
-                detail=f"Transcription failed: {transcript.error if hasattr(transcript, 'error') else 'Unknown error'}"
-            )
-
-        return TranscriptionResponse(
-            success=True,
-            transcription=transcript.text,
-            message="Transcription completed successfully"
-        )
+        return {
+            "success": True,
+            "transcription": transcription,
+            "message": "Transcription completed successfully"
+        }
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Transcription error: {str(e)}")
 
+@app.post("/transcribe-batch", response_model=List[TranscriptionResponse])
+async def transcribe_batch(audio_files: List[UploadFile] = File(...)):
+    """Transcribe several audio files concurrently using AssemblyAI"""
+    
+    if not settings.assemblyai_api_key:
+        raise HTTPException(status_code=500, detail="AssemblyAI API key not configured")
+    
+    if len(audio_files) > MAX_BATCH_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files (max {MAX_BATCH_FILES} per batch)"
+        )
+    
+    # Validate file types
+    for audio_file in audio_files:
+        if audio_file.content_type not in ALLOWED_AUDIO_TYPES:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Unsupported file type for transcription: {audio_file.content_type} ({audio_file.filename})"
+            )
+        check_upload_size(audio_file)
+    
+    # Files are already spooled by Starlette; hash them now and stream each
+    # one to AssemblyAI when its job starts, so no file is held in memory
+    digests = await asyncio.gather(*[hash_upload(f) for f in audio_files])
+    
+    async def transcribe_one(audio_file: UploadFile, digest: str) -> dict:
+        try:
+            transcription = await transcribe_audio(audio_file, digest)
+        except HTTPException as e:
+            if e.status_code == 503:
+                raise
+            return {"success": False, "message": e.detail}
+        except Exception as e:
+            return {"success": False, "message": f"Transcription error: {str(e)}"}
+        return {
+            "success": True,
+            "transcription": transcription,
+            "message": "Transcription completed successfully"
+        }
+    
+    # Jobs run concurrently; transcription_semaphore caps in-flight AssemblyAI calls
+    tasks = [
+        asyncio.ensure_future(transcribe_one(audio_file, digest))
+        for audio_file, digest in zip(audio_files, digests)
+    ]
+    try:
+        return await asyncio.gather(*tasks)
+    except HTTPException:
+        # Rate limiter saturated: cancel the remaining jobs and return the 503
+        # with its Retry-After header instead of a per-file failure
+        for task in tasks:
+            task.cancel()
+        raise
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
     return {
         "status": "healthy",
         "message": "Voice Agents API is running",
-        "murf_api_configured": bool(MURF_API_KEY),
-        "assemblyai_configured": bool(ASSEMBLYAI_API_KEY)
+        "murf_api_configured": bool(settings.murf_api_key),
+        "assemblyai_configured": bool(settings.assemblyai_api_key)
     }
 
 @app.delete("/cleanup-uploads")
-async def cleanup_uploads():
-    """Clean up temporary upload files (optional maintenance endpoint)"""
+def cleanup_uploads():
+    """Clean up temporary upload files (optional maintenance endpoint)
+
+    Declared as a plain function so FastAPI runs the blocking filesystem
+    calls in its threadpool instead of on the event loop.
+    """
     try:
-        deleted_count = 0
-        for file_path in UPLOADS_DIR.glob("*"):
-            if file_path.is_file():
-                file_path.unlink()
-                deleted_count += 1
+        # scandir's DirEntry carries the file type, avoiding a stat() per entry
+        with os.scandir(UPLOADS_DIR) as entries:
+            paths = [entry.path for entry in entries if entry.is_file(follow_symlinks=False)]
+        
+        # Unlink in parallel so many filesystem operations are in flight at once
+        with ThreadPoolExecutor(max_workers=CLEANUP_WORKERS) as executor:
+            deleted_count = sum(executor.map(remove_file, paths))
         
         return {
             "success": True,
@@ -281,5 +609,19 @@ async def cleanup_uploads():
         raise HTTPException(status_code=500, detail=f"Cleanup failed: {str(e)}")
 
 if __name__ == "__main__":
+    # Local/dev entrypoint. For production use gunicorn (see gunicorn.conf.py):
+    #   gunicorn main:app -c gunicorn.conf.py
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=8000, reload=True)
+    
+    # Run 4 workers unless WEB_CONCURRENCY is set, and export the count so
+    # each worker's rate limiters are sized for the real number of processes
+    workers = 1 if settings.dev_reload else (settings.web_concurrency or 4)
+    os.environ["WEB_CONCURRENCY"] = str(workers)
+    
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        reload=settings.dev_reload,
+        workers=workers
+    )